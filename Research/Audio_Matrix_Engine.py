@@ -1,6 +1,14 @@
 import sounddevice as sd
 import numpy as np
 import os
+import signal
+import sys
+from time import perf_counter
+from time import time as wall_clock
+
+import Instrumentation as inst
+import Audio_Telemetry as telemetry
+from Audio_Matrix_Stream import MeterPublisher, MONITOR_HOST, MONITOR_PORT, METER_RATE_HZ
 
 # --- COMPLIANCE CONFIGURATION ---
 AGG_DEVICE_NAME = "AutoDucker"
@@ -12,6 +20,12 @@ BLOCK_SIZE = 1024
 THRESHOLD_DB = -35.0   
 ATTACK_TIME = 0.05     
 RELEASE_TIME = 0.5     
+CLIP_LEVEL = 0.9
+SAFETY_ACTIVE_RMS = 0.01
+
+# --- TELEMETRY PARAMETERS ---
+ROOM_NAME = "default"
+TELEMETRY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "telemetry")
 
 # --- UI CONSTANTS ---
 GREEN, YELLOW, RED, BLUE = "\033[92m", "\033[93m", "\033[91m", "\033[94m"
@@ -28,11 +42,13 @@ class Microphone:
         self.location = location  
         self.gain = gain
         self.current_rms = 0.0
+        self.current_peak = 0.0
 
     def get_signal(self, indata):
         if self.index >= indata.shape[1]: return np.zeros(indata.shape[0])
         signal = indata[:, self.index].flatten() * self.gain
         self.current_rms = np.sqrt(np.mean(signal**2))
+        self.current_peak = np.max(np.abs(signal))
         return signal
 
     def get_meter(self, threshold_lin, width=20):
@@ -48,7 +64,7 @@ class AudioEngine:
     """
     The main processing engine for Compliance Path Determination.
     """
-    def __init__(self):
+    def __init__(self, telemetry_ring=None):
         self.fader = 0.0
         self.mics = [
             Microphone("Main Station", 0, location="DESK", gain=6.0),
@@ -58,11 +74,15 @@ class AudioEngine:
         self.threshold_lin = 10.0 ** (THRESHOLD_DB / 20.0)
         self.lp_attack = 1.0 - np.exp(-1.0 / (SAMPLE_RATE * ATTACK_TIME / BLOCK_SIZE))
         self.lp_release = 1.0 - np.exp(-1.0 / (SAMPLE_RATE * RELEASE_TIME / BLOCK_SIZE))
+        self.callback_timer = inst.CallbackTimer()
+        self.telemetry_ring = telemetry_ring
 
     def process(self, indata, outdata, frames, time, status):
+        callback_start = perf_counter()
         # Data Sanitization and Bus Assignment
         stat_sigs, wire_sigs, safe_sigs = [], [], []
         max_stat_rms = 0.0
+        max_safe_rms = 0.0
 
         for mic in self.mics:
             sig = mic.get_signal(indata)
@@ -71,6 +91,7 @@ class AudioEngine:
                 max_stat_rms = max(max_stat_rms, mic.current_rms)
             elif mic.location == "SAFETY":
                 safe_sigs.append(sig)
+                max_safe_rms = max(max_safe_rms, mic.current_rms)
             else:
                 wire_sigs.append(sig)
 
@@ -100,11 +121,21 @@ class AudioEngine:
         mixed = (stat_bus * gain_stat) + (wire_bus * gain_wire)
         mixed += safe_bus # Constant compliance path
         
-        mixed = np.clip(mixed, -0.9, 0.9) 
+        clip_count = np.count_nonzero(np.abs(mixed) > CLIP_LEVEL)
+        mixed = np.clip(mixed, -CLIP_LEVEL, CLIP_LEVEL) 
 
         outdata[:, 0] = mixed
         outdata[:, 1] = mixed
+
+        # Compliance Telemetry: fixed-size record into the preallocated ring
+        if self.telemetry_ring is not None:
+            flags = telemetry.status_flags(status)
+            if max_safe_rms > SAFETY_ACTIVE_RMS: flags |= telemetry.SAFETY_ACTIVE
+            if self.fader > 0.5: flags |= telemetry.DUCKING
+            self.telemetry_ring.write(wall_clock(), self.mics, self.fader, clip_count, flags)
+
         self.render_dashboard()
+        self.callback_timer.record(callback_start)
 
     def render_dashboard(self):
         out = f"{TOP_LEFT}{YELLOW}{BOLD}=== IC.ME Matrix Hub ==={RESET}\n"
@@ -121,7 +152,17 @@ class AudioEngine:
         print(out, end="")
 
 if __name__ == "__main__":
-    engine = AudioEngine()
+    telemetry_ring = telemetry.TelemetryRing()
+    engine = AudioEngine(telemetry_ring=telemetry_ring)
+    telemetry_writer = telemetry.TelemetryWriter(
+        telemetry_ring, TELEMETRY_DIR, channel_names=[m.name for m in engine.mics],
+        room=ROOM_NAME, block_s=BLOCK_SIZE / SAMPLE_RATE
+    )
+    telemetry_writer.start()
+    # Service managers stop the engine with SIGTERM; exit through the finally block below
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    meter_publisher = MeterPublisher(engine, room=ROOM_NAME, address=(MONITOR_HOST, MONITOR_PORT), rate_hz=METER_RATE_HZ)
+    meter_publisher.start()
     all_indices = [m.index for m in engine.mics]
     total_ch = max(all_indices) + 1 if all_indices else 1
     os.system('clear' if os.name == 'posix' else 'cls')
@@ -130,6 +171,17 @@ if __name__ == "__main__":
         with sd.Stream(device=(AGG_DEVICE_NAME, OUT_DEVICE_NAME),
                        samplerate=SAMPLE_RATE, blocksize=BLOCK_SIZE,
                        channels=(total_ch, 2), callback=engine.process):
-            while True: sd.sleep(1000)
+            while True:
+                sd.sleep(1000)
+                inst.observe_many("audio.callback_ms", engine.callback_timer.drain_ms())
     except KeyboardInterrupt:
-        print(f"\n{SHOW_CURSOR}{RED}Matrix Engine Offline.{RESET}")
\ No newline at end of file
+        print(f"\n{SHOW_CURSOR}{RED}Matrix Engine Offline.{RESET}")
+    finally:
+        # Every exit path (Ctrl-C, SIGTERM or a device error) stops the monitor, flushes
+        # compliance history and exports timings
+        meter_publisher.stop()
+        telemetry_writer.stop()
+        print(f"Callback Timing: {engine.callback_timer.summary(budget_s=BLOCK_SIZE / SAMPLE_RATE)}")
+        if os.environ.get(inst.TRACE_FILE_ENV):
+            inst.export_snapshot(os.environ[inst.TRACE_FILE_ENV])
+        print(f"Telemetry: {telemetry_writer.files_written} segment(s) in {TELEMETRY_DIR}, {telemetry_ring.dropped} record(s) dropped")
\ No newline at end of file
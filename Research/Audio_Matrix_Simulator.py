@@ -0,0 +1,291 @@
+import csv
+import struct
+
+import numpy as np
+
+# --- ENGINE DEFAULTS (mirror Audio_Matrix_Engine.py, which needs audio hardware to import) ---
+SAMPLE_RATE = 48000
+BLOCK_SIZE = 1024
+THRESHOLD_DB = -35.0
+ATTACK_TIME = 0.05
+RELEASE_TIME = 0.5
+
+# Engine status flips to STATIONARY PRIORITY above this fader value
+PRIORITY_FADER = 0.5
+FLOOR_DB = -120.0
+
+# --- TRACE IMPORT ---
+LEVEL_COLUMN_HINTS = ("db", "level", "rms")
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+def block_coefficient(time_constant, sample_rate=SAMPLE_RATE, block_size=BLOCK_SIZE):
+    """
+    One-pole smoothing coefficient per processed block, as computed in AudioEngine.__init__.
+    """
+    return 1.0 - np.exp(-1.0 / (sample_rate * np.asarray(time_constant, dtype=np.float64) / block_size))
+
+
+def parameter_grid(thresholds_db, attack_times, release_times):
+    """
+    Cartesian product of the three settings, flattened to one entry per configuration.
+    """
+    t, a, r = np.meshgrid(
+        np.asarray(thresholds_db, dtype=np.float64),
+        np.asarray(attack_times, dtype=np.float64),
+        np.asarray(release_times, dtype=np.float64),
+        indexing="ij",
+    )
+    return t.ravel(), a.ravel(), r.ravel()
+
+
+def simulate_grid(levels_db, thresholds_db, attack_times, release_times,
+                  sample_rate=SAMPLE_RATE, block_size=BLOCK_SIZE, initial_fader=0.0, keep_trajectories=False):
+    """
+    Compliance Path Simulation: runs the AudioEngine fader recursion for every
+    threshold/attack/release combination at once.
+
+    levels_db is the per-block RMS level of the Desk bus in dBFS, shape (n_blocks,),
+    or (n_desk_mics, n_blocks) in which case the loudest mic drives the gate like max_stat_rms.
+    Time runs sequentially; every step is vectorized across the grid.
+    Trajectories cost n_configs x n_blocks floats, so large sweeps should keep only the
+    statistics and re-run chosen configurations through simulate_configs().
+    """
+    thresholds, attacks, releases = parameter_grid(thresholds_db, attack_times, release_times)
+    return simulate_configs(levels_db, thresholds, attacks, releases, sample_rate=sample_rate,
+                            block_size=block_size, initial_fader=initial_fader, keep_trajectories=keep_trajectories)
+
+
+def simulate_configs(levels_db, thresholds, attacks, releases,
+                     sample_rate=SAMPLE_RATE, block_size=BLOCK_SIZE, initial_fader=0.0, keep_trajectories=True):
+    """
+    Same recursion as simulate_grid() for an explicit list of configurations:
+    thresholds[i], attacks[i] and releases[i] describe configuration i.
+    """
+    levels_db = np.asarray(levels_db, dtype=np.float64)
+    if levels_db.ndim == 2:
+        levels_db = levels_db.max(axis=0)
+    level_lin = 10.0 ** (levels_db / 20.0)
+
+    thresholds, attacks, releases = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(thresholds, dtype=np.float64)),
+        np.atleast_1d(np.asarray(attacks, dtype=np.float64)),
+        np.atleast_1d(np.asarray(releases, dtype=np.float64)),
+    )
+    threshold_lin = 10.0 ** (thresholds / 20.0)
+    lp_attack = block_coefficient(attacks, sample_rate, block_size)
+    lp_release = block_coefficient(releases, sample_rate, block_size)
+
+    n_configs, n_blocks = thresholds.size, level_lin.size
+    fader = np.full(n_configs, initial_fader, dtype=np.float64)
+    trajectories = np.empty((n_configs, n_blocks), dtype=np.float32) if keep_trajectories else None
+
+    gate_blocks = np.zeros(n_configs, dtype=np.int64)
+    priority_blocks = np.zeros(n_configs, dtype=np.int64)
+    duck_events = np.zeros(n_configs, dtype=np.int64)
+    wire_gain_sum = np.zeros(n_configs, dtype=np.float64)
+    wire_gain_min = np.ones(n_configs, dtype=np.float64)
+    in_priority = fader > PRIORITY_FADER
+
+    for i in range(n_blocks):
+        # Altruistic Logic Gate: Stationary Priority (same recursion as AudioEngine.process)
+        gate = level_lin[i] > threshold_lin
+        target = gate.astype(np.float64)
+        alpha = np.where(target > fader, lp_attack, lp_release)
+        fader += (target - fader) * alpha
+        np.clip(fader, 0.0, 1.0, out=fader)
+
+        gate_blocks += gate
+        now_priority = fader > PRIORITY_FADER
+        priority_blocks += now_priority
+        duck_events += now_priority & ~in_priority
+        in_priority = now_priority
+
+        wire_gain = (1.0 - fader) ** 2
+        wire_gain_sum += wire_gain
+        np.minimum(wire_gain_min, wire_gain, out=wire_gain_min)
+
+        if keep_trajectories:
+            trajectories[:, i] = fader
+
+    block_s = block_size / sample_rate
+    n = max(n_blocks, 1)
+    return {
+        "threshold_db": thresholds,
+        "attack_s": attacks,
+        "release_s": releases,
+        "block_s": block_s,
+        "fader": trajectories,
+        "stats": {
+            "gate_open_fraction": gate_blocks / n,
+            "priority_fraction": priority_blocks / n,
+            "duck_events": duck_events,
+            "ducks_per_min": duck_events / (n * block_s / 60.0),
+            "mean_wire_gain": wire_gain_sum / n,
+            "min_wire_gain": wire_gain_min,
+        },
+    }
+
+
+def synthetic_levels(duration_s=60.0, talk_fraction=0.3, mean_burst_s=2.0, speech_db=-28.0,
+                     noise_db=-55.0, sample_rate=SAMPLE_RATE, block_size=BLOCK_SIZE, seed=0):
+    """
+    Desk-mic level trace (dBFS per block): a two-state talk/silence Markov chain with
+    syllable-rate modulation during speech and a jittered noise floor.
+    """
+    rng = np.random.default_rng(seed)
+    block_s = block_size / sample_rate
+    n_blocks = int(duration_s / block_s)
+
+    # Transition probabilities that give the requested talk fraction and mean burst length
+    p_stop = min(1.0, block_s / mean_burst_s)
+    p_start = min(1.0, p_stop * talk_fraction / max(1e-9, 1.0 - talk_fraction))
+    draws = rng.random(n_blocks)
+    talking = np.zeros(n_blocks, dtype=bool)
+    state = False
+    for i in range(n_blocks):
+        state = draws[i] >= p_stop if state else draws[i] < p_start
+        talking[i] = state
+
+    t = np.arange(n_blocks) * block_s
+    syllables = 6.0 * np.sin(2 * np.pi * 4.0 * t + rng.uniform(0, 2 * np.pi)) + rng.normal(0, 3.0, n_blocks)
+    noise = noise_db + rng.normal(0, 2.0, n_blocks)
+    return np.where(talking, np.maximum(speech_db + syllables, noise), noise)
+
+
+def _read_bytes(file):
+    if hasattr(file, "read"):
+        return file.read()
+    with open(file, "rb") as f:
+        return f.read()
+
+
+def csv_columns(file):
+    """
+    Numeric columns of a CSV file or buffer as {name: values}, in file order.
+    A first row with any non-numeric cell is taken as the header; otherwise columns are numbered.
+    Non-numeric cells become NaN; columns with no numeric cells are left out.
+    """
+    raw = _read_bytes(file)
+    if isinstance(raw, bytes):
+        raw = raw.decode("utf-8-sig")
+    rows = [row for row in csv.reader(raw.splitlines()) if any(cell.strip() for cell in row)]
+    if not rows:
+        return {}
+
+    def number(cell):
+        try:
+            return float(cell)
+        except ValueError:
+            return np.nan
+
+    first = [number(cell) for cell in rows[0]]
+    if np.isnan(first).any():
+        header, rows = [cell.strip() for cell in rows[0]], rows[1:]
+    else:
+        header = []
+    width = max([len(header)] + [len(row) for row in rows])
+    header = header + [f"Column {i + 1}" for i in range(len(header), width)]
+
+    table = np.full((len(rows), width), np.nan)
+    for i, row in enumerate(rows):
+        table[i, : len(row)] = [number(cell) for cell in row]
+    return {name: table[:, j] for j, name in enumerate(header) if np.isfinite(table[:, j]).any()}
+
+
+def level_column(names):
+    """
+    The one column name that looks like a level (dB/level/RMS), or None if there is not exactly one.
+    """
+    matches = [name for name in names if any(hint in name.lower() for hint in LEVEL_COLUMN_HINTS)]
+    return matches[0] if len(matches) == 1 else None
+
+
+def levels_from_columns(columns, column=None):
+    """
+    Picks the level trace (dBFS per block) out of csv_columns() output.
+    The column is chosen by name; without one, a single numeric column or a single level-named
+    column is used, and anything ambiguous (e.g. time_s,level_db with no header) raises ValueError.
+    """
+    if not columns:
+        raise ValueError("No numeric columns found in the level trace.")
+    if column is None:
+        column = next(iter(columns)) if len(columns) == 1 else level_column(columns)
+    if column is None:
+        raise ValueError(f"Several numeric columns ({', '.join(columns)}); choose the level column.")
+    if column not in columns:
+        raise ValueError(f"Level column '{column}' not found; numeric columns: {', '.join(columns)}.")
+    values = columns[column]
+    return values[np.isfinite(values)]
+
+
+def levels_from_csv(file, column=None):
+    """
+    Reads a level trace (dBFS per block) from a CSV file or buffer; see levels_from_columns().
+    """
+    return levels_from_columns(csv_columns(file), column)
+
+
+def _wav_format(raw):
+    """
+    Walks the RIFF chunks of a WAV file. Returns (format_tag, n_channels, sample_rate, width, frames).
+    WAVE_FORMAT_EXTENSIBLE is resolved to its sub-format.
+    """
+    if len(raw) < 12 or raw[:4] != b"RIFF" or raw[8:12] != b"WAVE":
+        raise ValueError("Not a RIFF/WAVE file.")
+    fmt, frames, offset = None, None, 12
+    while offset + 8 <= len(raw) and (fmt is None or frames is None):
+        chunk_id = raw[offset:offset + 4]
+        chunk_size = struct.unpack_from("<I", raw, offset + 4)[0]
+        body = raw[offset + 8: offset + 8 + chunk_size]
+        if chunk_id == b"fmt ":
+            if len(body) < 16:
+                raise ValueError("Truncated WAV fmt chunk.")
+            fmt = struct.unpack_from("<HHIIHH", body)
+            if fmt[0] == WAVE_FORMAT_EXTENSIBLE:
+                if len(body) < 26:
+                    raise ValueError("Truncated WAVE_FORMAT_EXTENSIBLE fmt chunk.")
+                fmt = (struct.unpack_from("<H", body, 24)[0],) + fmt[1:]
+        elif chunk_id == b"data":
+            frames = body
+        offset += 8 + chunk_size + (chunk_size & 1)
+    if fmt is None or frames is None:
+        raise ValueError("WAV file has no fmt or data chunk.")
+
+    format_tag, n_channels, sample_rate, _, _, bits = fmt
+    if n_channels == 0:
+        raise ValueError("WAV file reports zero channels.")
+    width = (bits + 7) // 8
+    frame_bytes = n_channels * width
+    return format_tag, n_channels, sample_rate, width, frames[: len(frames) - len(frames) % frame_bytes]
+
+
+def levels_from_wav(file, channel=0, gain=1.0, block_size=BLOCK_SIZE):
+    """
+    Converts a WAV recording (8/16/24/32-bit PCM or 32/64-bit float) into per-block RMS levels (dBFS)
+    the way Microphone.get_signal measures them. Returns (levels_db, sample_rate).
+    """
+    format_tag, n_channels, sample_rate, width, frames = _wav_format(_read_bytes(file))
+
+    if format_tag == WAVE_FORMAT_PCM and width == 1:
+        samples = (np.frombuffer(frames, dtype=np.uint8).astype(np.float64) - 128.0) / 128.0
+    elif format_tag == WAVE_FORMAT_PCM and width == 2:
+        samples = np.frombuffer(frames, dtype="<i2").astype(np.float64) / 32768.0
+    elif format_tag == WAVE_FORMAT_PCM and width == 3:
+        # Widen each little-endian 3-byte sample into the top of an int32, then shift back to sign-extend
+        packed = np.frombuffer(frames, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        samples = ((packed[:, 0] << 8 | packed[:, 1] << 16 | packed[:, 2] << 24) >> 8).astype(np.float64) / 8388608.0
+    elif format_tag == WAVE_FORMAT_PCM and width == 4:
+        samples = np.frombuffer(frames, dtype="<i4").astype(np.float64) / 2147483648.0
+    elif format_tag == WAVE_FORMAT_IEEE_FLOAT and width in (4, 8):
+        samples = np.frombuffer(frames, dtype="<f4" if width == 4 else "<f8").astype(np.float64)
+    else:
+        raise ValueError(f"Unsupported WAV encoding: format {format_tag}, {width * 8} bits")
+
+    signal = samples.reshape(-1, n_channels)[:, min(channel, n_channels - 1)] * gain
+    n_blocks = signal.size // block_size
+    blocks = signal[: n_blocks * block_size].reshape(n_blocks, block_size)
+    rms = np.sqrt(np.mean(blocks ** 2, axis=1))
+    return 20.0 * np.log10(np.maximum(rms, 10.0 ** (FLOOR_DB / 20.0))), sample_rate
@@ -0,0 +1,144 @@
+import json
+import socket
+import threading
+import time
+
+import numpy as np
+
+import Audio_Telemetry as telemetry
+
+# --- STREAM CONFIGURATION ---
+MONITOR_HOST = "127.0.0.1"
+MONITOR_PORT = 47800
+METER_RATE_HZ = 10.0
+MAX_PACKET_BYTES = 8192
+STALE_AFTER_S = 3.0
+
+
+class MeterPublisher(threading.Thread):
+    """
+    Publishes decimated meter/fader snapshots of a running AudioEngine over UDP.
+    Runs beside the audio callback and only reads engine state: sends are non-blocking
+    and dropped on error, so a slow or absent monitor never reaches the callback.
+    """
+    def __init__(self, engine, room="default", address=(MONITOR_HOST, MONITOR_PORT), rate_hz=METER_RATE_HZ):
+        super().__init__(name="meter-publisher", daemon=True)
+        self.engine = engine
+        self.room = room
+        self.address = address
+        self.interval = 1.0 / max(rate_hz, 0.1)
+        self.seq = 0
+        self.send_errors = 0
+        self._ring_cursor = engine.telemetry_ring.head if engine.telemetry_ring is not None else 0
+        self._stop_event = threading.Event()
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setblocking(False)
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self.publish()
+        self.sock.close()
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def snapshot(self):
+        """
+        Current state of the engine. With a telemetry ring attached, levels are held at their
+        maximum since the previous snapshot and clip/xrun counts cover the whole interval.
+        """
+        mics = self.engine.mics
+        rms = [float(m.current_rms) for m in mics]
+        peak = [float(m.current_peak) for m in mics]
+        clipped, xruns, blocks = 0, 0, 0
+
+        ring = self.engine.telemetry_ring
+        if ring is not None:
+            records, self._ring_cursor = ring.peek(self._ring_cursor)
+            blocks = len(records)
+            if blocks:
+                n = min(len(mics), ring.max_channels)
+                rms = records["rms"][:, :n].max(axis=0).astype(float).tolist()
+                peak = records["peak"][:, :n].max(axis=0).astype(float).tolist()
+                clipped = int(records["clip_count"].sum())
+                xruns = int(np.count_nonzero(records["flags"] & telemetry.XRUN_MASK))
+
+        fader = float(self.engine.fader)
+        return {
+            "room": self.room,
+            "seq": self.seq,
+            "time": time.time(),
+            "fader": round(fader, 4),
+            "mode": "STATIONARY PRIORITY" if fader > 0.5 else "FIELD ACTIVE",
+            "blocks": blocks,
+            "clipped_samples": clipped,
+            "xrun_blocks": xruns,
+            "channels": [
+                {"name": m.name, "location": m.location, "rms": round(r, 5), "peak": round(p, 5)}
+                for m, r, p in zip(mics, rms, peak)
+            ],
+        }
+
+    def publish(self):
+        packet = json.dumps(self.snapshot(), separators=(",", ":")).encode("utf-8")
+        self.seq += 1
+        try:
+            self.sock.sendto(packet[:MAX_PACKET_BYTES], self.address)
+        except OSError:
+            self.send_errors += 1
+
+
+class MeterSubscriber(threading.Thread):
+    """
+    Receives snapshots from any number of engines (one per room) and keeps the latest per room.
+    One instance per process; readers call latest() from any thread.
+    """
+    def __init__(self, address=("0.0.0.0", MONITOR_PORT), stale_after=STALE_AFTER_S):
+        super().__init__(name="meter-subscriber", daemon=True)
+        self.stale_after = stale_after
+        self.rooms = {}
+        self.packets = 0
+        self.bad_packets = 0
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind(address)
+        self.sock.settimeout(0.5)
+
+    def run(self):
+        while not self._stop_event.is_set():
+            try:
+                packet, _ = self.sock.recvfrom(MAX_PACKET_BYTES)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            try:
+                snapshot = json.loads(packet)
+                room = snapshot["room"]
+            except (ValueError, KeyError, TypeError):
+                self.bad_packets += 1
+                continue
+            with self._lock:
+                self.rooms[room] = (time.time(), snapshot)
+                self.packets += 1
+        self.sock.close()
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def latest(self):
+        """
+        Returns {room: snapshot} with `age_s` and `stale` added to each snapshot.
+        """
+        now = time.time()
+        with self._lock:
+            rooms = dict(self.rooms)
+        result = {}
+        for room, (received, snapshot) in sorted(rooms.items()):
+            age = now - received
+            result[room] = {**snapshot, "age_s": round(age, 2), "stale": age > self.stale_after}
+        return result
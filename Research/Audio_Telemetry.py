@@ -0,0 +1,374 @@
+import argparse
+import glob
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+# --- TELEMETRY CONFIGURATION ---
+MAX_CHANNELS = 8
+RING_CAPACITY = 1 << 15     # ~11 minutes of 1024-sample blocks at 48 kHz
+FLUSH_INTERVAL = 1.0        # seconds between ring drains
+ROTATE_INTERVAL = 900.0     # seconds of data per merged segment file
+FILE_PREFIX = "telemetry"
+
+# --- STATUS FLAGS (bitmask per record) ---
+INPUT_UNDERFLOW = 1 << 0
+INPUT_OVERFLOW = 1 << 1
+OUTPUT_UNDERFLOW = 1 << 2
+OUTPUT_OVERFLOW = 1 << 3
+PRIMING_OUTPUT = 1 << 4
+SAFETY_ACTIVE = 1 << 5
+DUCKING = 1 << 6
+XRUN_MASK = INPUT_UNDERFLOW | INPUT_OVERFLOW | OUTPUT_UNDERFLOW | OUTPUT_OVERFLOW
+
+COLUMNS = ("time", "rms", "peak", "fader", "clip_count", "flags")
+
+
+def record_dtype(max_channels=MAX_CHANNELS):
+    return np.dtype([
+        ("time", np.float64),
+        ("rms", np.float32, (max_channels,)),
+        ("peak", np.float32, (max_channels,)),
+        ("fader", np.float32),
+        ("clip_count", np.uint32),
+        ("flags", np.uint16),
+    ])
+
+
+def status_flags(status):
+    """
+    Packs a sounddevice CallbackFlags object into the telemetry bitmask.
+    """
+    flags = 0
+    if status:
+        if status.input_underflow: flags |= INPUT_UNDERFLOW
+        if status.input_overflow: flags |= INPUT_OVERFLOW
+        if status.output_underflow: flags |= OUTPUT_UNDERFLOW
+        if status.output_overflow: flags |= OUTPUT_OVERFLOW
+        if status.priming_output: flags |= PRIMING_OUTPUT
+    return flags
+
+
+class TelemetryRing:
+    """
+    Single-producer/single-consumer ring of fixed-size telemetry records.
+    The audio callback writes scalars into preallocated column views and bumps `head`;
+    the writer thread copies out everything between `tail` and `head`. No locks are taken.
+    """
+    def __init__(self, capacity=RING_CAPACITY, max_channels=MAX_CHANNELS):
+        if capacity & (capacity - 1):
+            raise ValueError("Ring capacity must be a power of two.")
+        self.capacity = capacity
+        self.mask = capacity - 1
+        self.max_channels = max_channels
+        self.buffer = np.zeros(capacity, dtype=record_dtype(max_channels))
+        # Column views are created once so writes never build temporary record objects
+        self._time = self.buffer["time"]
+        self._rms = self.buffer["rms"]
+        self._peak = self.buffer["peak"]
+        self._fader = self.buffer["fader"]
+        self._clip_count = self.buffer["clip_count"]
+        self._flags = self.buffer["flags"]
+        self.head = 0
+        self.tail = 0
+        self.dropped = 0
+
+    def write(self, timestamp, mics, fader, clip_count, flags):
+        """
+        Called from the audio callback. Only scalar stores into preallocated arrays.
+        """
+        i = self.head & self.mask
+        self._time[i] = timestamp
+        for c in range(min(len(mics), self.max_channels)):
+            self._rms[i, c] = mics[c].current_rms
+            self._peak[i, c] = mics[c].current_peak
+        self._fader[i] = fader
+        self._clip_count[i] = clip_count
+        self._flags[i] = flags
+        self.head += 1
+
+    def drain(self):
+        """
+        Called from the writer thread. Returns a copy of the records written since the last drain.
+        Records the producer overwrote before they could be copied are counted in `dropped`.
+        """
+        head = self.head
+        # Slot head - capacity is the one the producer writes next, so it may be half-written
+        start = max(self.tail, head - self.capacity + 1)
+        self.dropped += start - self.tail
+        if head == start:
+            self.tail = head
+            return self.buffer[:0].copy()
+
+        idx = np.arange(start, head) & self.mask
+        batch = self.buffer[idx]
+
+        # Anything the producer lapped while copying may be torn; discard it
+        lapped = self.head - self.capacity
+        if lapped + 1 > start:
+            torn = min(lapped + 1, head) - start
+            batch = batch[torn:]
+            self.dropped += torn
+        self.tail = head
+        return batch
+
+    def peek(self, since):
+        """
+        Read-only view for secondary observers (e.g. the meter publisher): copies records
+        written after `since` without advancing `tail`. Returns (records, head).
+        """
+        head = self.head
+        start = max(since, head - self.capacity + 1)
+        if head <= start:
+            return self.buffer[:0].copy(), head
+        return self.buffer[np.arange(start, head) & self.mask], head
+
+
+class TelemetryWriter(threading.Thread):
+    """
+    Background thread: drains the ring every FLUSH_INTERVAL and persists each batch as a
+    compressed part file, so a crash loses at most one flush interval. Every ROTATE_INTERVAL
+    the current segment's parts are merged into one column-per-array .npz segment.
+    """
+    def __init__(self, ring, directory, channel_names=(), room="default",
+                 flush_interval=FLUSH_INTERVAL, rotate_interval=ROTATE_INTERVAL, block_s=None):
+        super().__init__(name="telemetry-writer", daemon=True)
+        self.ring = ring
+        self.directory = directory
+        self.channel_names = list(channel_names)
+        self.room = room
+        self.flush_interval = flush_interval
+        self.rotate_interval = rotate_interval
+        self.block_s = block_s
+        self.segment_start = None
+        self.segment_stamp = None
+        self.part_seq = 0
+        self.files_written = 0
+        self._stop_event = threading.Event()
+        os.makedirs(directory, exist_ok=True)
+        # Parts left behind by a crash are merged before new data arrives
+        for stamp in sorted({_file_stamp(p) for p in self._part_files("*")}):
+            self.merge_segment(stamp)
+
+    def run(self):
+        while not self._stop_event.wait(self.flush_interval):
+            self.flush()
+        self.flush(final=True)
+
+    def stop(self):
+        self._stop_event.set()
+        if self.is_alive():
+            self.join()
+
+    def flush(self, final=False):
+        batch = self.ring.drain()
+        if len(batch):
+            if self.segment_start is None:
+                self.segment_start = float(batch["time"][0])
+                self.segment_stamp = _stamp(self.segment_start)
+                self.part_seq = 0
+            part_path = os.path.join(
+                self.directory, f"{FILE_PREFIX}_{self.room}_{self.segment_stamp}.part{self.part_seq:05d}.npz"
+            )
+            self._write_columns(part_path, {column: batch[column] for column in COLUMNS})
+            self.part_seq += 1
+        if self.segment_start is None:
+            return
+        if final or time.time() - self.segment_start >= self.rotate_interval:
+            self.merge_segment(self.segment_stamp)
+            self.segment_start = None
+            self.segment_stamp = None
+
+    def merge_segment(self, stamp):
+        """
+        Merges the part files of one segment into the final segment file and removes them.
+        """
+        parts = sorted(self._part_files(stamp))
+        if not parts:
+            return None
+        segment_path = os.path.join(self.directory, f"{FILE_PREFIX}_{self.room}_{stamp}.npz")
+        if not os.path.exists(segment_path):
+            pieces = {column: [] for column in COLUMNS}
+            for part in parts:
+                with np.load(part) as data:
+                    for column in COLUMNS:
+                        pieces[column].append(data[column])
+            self._write_columns(segment_path, {column: np.concatenate(p) for column, p in pieces.items()})
+            self.files_written += 1
+        for part in parts:
+            os.remove(part)
+        return segment_path
+
+    def _part_files(self, stamp):
+        parts = glob.glob(os.path.join(self.directory, f"{FILE_PREFIX}_{glob.escape(self.room)}_{stamp}.part*.npz"))
+        return [p for p in parts if _file_room(p) == self.room]
+
+    def _write_columns(self, path, columns):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez_compressed(
+                f,
+                **columns,
+                channel_names=np.array(self.channel_names, dtype=str),
+                block_s=np.float64(self.block_s or 0.0),
+                dropped=np.int64(self.ring.dropped),
+            )
+        os.replace(tmp_path, path)
+
+
+# --- QUERY HELPERS ---
+STAMP_FORMAT = "%Y%m%dT%H%M%S"
+
+
+def _stamp(timestamp):
+    # Millisecond precision keeps back-to-back segments (e.g. after a quick restart) distinct
+    moment = datetime.fromtimestamp(timestamp)
+    return moment.strftime(STAMP_FORMAT) + f"{moment.microsecond // 1000:03d}"
+
+
+def _file_stamp(path):
+    # telemetry_<room>_<YYYYmmddTHHMMSSfff>[.partNNNNN].npz
+    return os.path.basename(path).rsplit("_", 1)[-1].split(".", 1)[0]
+
+
+def _file_room(path):
+    return os.path.basename(path)[len(FILE_PREFIX) + 1:].rsplit("_", 1)[0]
+
+
+def rooms(directory):
+    """
+    Rooms with telemetry in a directory, sorted by name.
+    """
+    return sorted({_file_room(f) for f in glob.glob(os.path.join(directory, f"{FILE_PREFIX}_*_*.npz"))})
+
+
+def segment_files(directory, room, start=None, end=None):
+    """
+    Segment and part files for one room, oldest first. Files that start after `end`, or more than
+    one rotation before `start`, cannot hold records in the window and are skipped. Parts are
+    skipped once their merged segment exists.
+    """
+    # The glob also matches rooms that merely start with `room_`; keep exact matches only
+    files = glob.glob(os.path.join(directory, f"{FILE_PREFIX}_{glob.escape(room)}_*.npz"))
+    files = [f for f in files if _file_room(f) == room]
+    merged = {f[:-len(".npz")] for f in files if ".part" not in os.path.basename(f)}
+    files = [f for f in files if ".part" not in os.path.basename(f) or f.rsplit(".part", 1)[0] not in merged]
+    if start is not None:
+        earliest = (start - timedelta(seconds=ROTATE_INTERVAL + FLUSH_INTERVAL)).strftime(STAMP_FORMAT)
+        files = [f for f in files if _file_stamp(f) >= earliest]
+    if end is not None:
+        cutoff = end.strftime(STAMP_FORMAT) + "999"
+        files = [f for f in files if _file_stamp(f) <= cutoff]
+    return sorted(files, key=lambda f: (_file_stamp(f), f))
+
+
+def load(directory, room, start=None, end=None):
+    """
+    Concatenates every column of one room between start and end (datetimes, inclusive) across
+    segment files. Rooms are never mixed: each one is a separate time series.
+    """
+    columns = {column: [] for column in COLUMNS}
+    channel_names, block_s = [], 0.0
+    for path in segment_files(directory, room, start, end):
+        with np.load(path) as segment:
+            times = segment["time"]
+            keep = np.ones(times.size, dtype=bool)
+            if start is not None: keep &= times >= start.timestamp()
+            if end is not None: keep &= times <= end.timestamp()
+            if not keep.any():
+                continue
+            for column in COLUMNS:
+                columns[column].append(segment[column][keep])
+            channel_names = list(segment["channel_names"]) or channel_names
+            block_s = float(segment["block_s"]) or block_s
+
+    data = {column: np.concatenate(parts) if parts else np.zeros(0) for column, parts in columns.items()}
+    data["channel_names"] = channel_names
+    data["block_s"] = block_s
+    return data
+
+
+def summarize(directory, room, start, end):
+    """
+    Compliance summary of one room for a window: bus activity durations, duck events, clipping
+    and xruns, plus per-channel level statistics in dBFS.
+    """
+    data = load(directory, room, start, end)
+    n = data["time"].size
+    if n == 0:
+        return {"room": room, "records": 0, "start": str(start), "end": str(end)}
+
+    block_s = data["block_s"]
+    if not block_s and n > 1:
+        block_s = float(np.median(np.diff(data["time"])))
+    flags = data["flags"].astype(np.uint16)
+    ducking = (flags & DUCKING) > 0
+    safety = (flags & SAFETY_ACTIVE) > 0
+    xruns = (flags & XRUN_MASK) > 0
+
+    channels = []
+    for c, name in enumerate(data["channel_names"]):
+        rms = data["rms"][:, c]
+        peak = data["peak"][:, c]
+        channels.append({
+            "channel": str(name),
+            "mean_rms_dbfs": float(20 * np.log10(max(float(np.sqrt(np.mean(rms.astype(np.float64) ** 2))), 1e-6))),
+            "max_peak_dbfs": float(20 * np.log10(max(float(peak.max()), 1e-6))),
+        })
+
+    return {
+        "room": room,
+        "start": str(start),
+        "end": str(end),
+        "records": int(n),
+        "covered_s": round(n * block_s, 3),
+        "first_record": datetime.fromtimestamp(float(data["time"][0])).isoformat(timespec="seconds"),
+        "last_record": datetime.fromtimestamp(float(data["time"][-1])).isoformat(timespec="seconds"),
+        "safety_active_s": round(int(safety.sum()) * block_s, 3),
+        "ducking_s": round(int(ducking.sum()) * block_s, 3),
+        "duck_events": int(np.count_nonzero(ducking[1:] & ~ducking[:-1]) + ducking[0]),
+        "clipped_blocks": int(np.count_nonzero(data["clip_count"])),
+        "clipped_samples": int(data["clip_count"].sum()),
+        "xrun_blocks": int(xruns.sum()),
+        "mean_fader": round(float(data["fader"].mean()), 4),
+        "channels": channels,
+    }
+
+
+def summarize_shift(directory, room, shift_start, hours=8.0):
+    return summarize(directory, room, shift_start, shift_start + timedelta(hours=hours))
+
+
+def summarize_rooms(directory, shift_start, hours=8.0):
+    """
+    One shift summary per room in the directory, keyed by room.
+    """
+    return {room: summarize_shift(directory, room, shift_start, hours) for room in rooms(directory)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Summarize Audio Matrix compliance telemetry for a shift.")
+    parser.add_argument("--dir", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "telemetry"))
+    parser.add_argument("--room", default=None, help="Summarize one room (default: each room separately)")
+    parser.add_argument("--start", required=True, help="Shift start, e.g. '2026-10-19 06:00'")
+    parser.add_argument("--hours", type=float, default=8.0)
+    args = parser.parse_args()
+
+    shift_start = datetime.fromisoformat(args.start)
+    if args.room is None:
+        summaries = list(summarize_rooms(args.dir, shift_start, args.hours).values())
+    else:
+        summaries = [summarize_shift(args.dir, args.room, shift_start, args.hours)]
+    if not summaries:
+        print(f"No telemetry in {args.dir}")
+    for summary in summaries:
+        print(f"=== {summary['room']} ===")
+        for key, value in summary.items():
+            if key == "channels":
+                for channel in value:
+                    print(f"  {channel['channel']:<15} | mean {channel['mean_rms_dbfs']:7.1f} dBFS | peak {channel['max_peak_dbfs']:7.1f} dBFS")
+            elif key != "room":
+                print(f"{key:<16}: {value}")
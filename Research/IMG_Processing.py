@@ -1,12 +1,16 @@
 from PIL import ExifTags, Image
 
+import Instrumentation as inst
+
 def image_location(img_path):
     """
     Validation through Data Ingestion.
     Extracts spatial metadata from site documentation to visualize conditions with precision.
     """
-    img = Image.open(img_path)
-    exif_reader = { ExifTags.TAGS[k]: v for k, v in img._getexif().items() if k in ExifTags.TAGS }
+    with inst.span("img.exif"):
+        img = Image.open(img_path)
+        exif_reader = { ExifTags.TAGS[k]: v for k, v in img._getexif().items() if k in ExifTags.TAGS }
+    inst.count("img.processed")
 
     GPS_NS = exif_reader['GPSInfo'][1]
     NS_list = exif_reader['GPSInfo'][2]
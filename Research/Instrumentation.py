@@ -0,0 +1,338 @@
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+
+import numpy as np
+
+# --- INSTRUMENTATION CONFIGURATION ---
+# Set ICME_TRACE_FILE to a path to enable instrumentation for the whole process and
+# append every finished span to that JSON-lines file. Otherwise it is enabled per run
+# (per Streamlit rerun thread) through begin_run(enabled=...).
+TRACE_FILE_ENV = "ICME_TRACE_FILE"
+
+# Histogram bucket upper bounds (milliseconds for timings, raw units otherwise)
+DEFAULT_BUCKETS = (0.1, 0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+ENABLED = False             # process-wide switch (ICME_TRACE_FILE, benchmarks)
+_export_path = None
+_lock = threading.Lock()
+_local = threading.local()
+_counters = {}
+_histograms = {}
+
+
+class _NullSpan:
+    """
+    Shared no-op span returned while instrumentation is disabled.
+    """
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """
+    Named timing span. Records wall time in milliseconds on exit, plus its nesting depth and
+    parent span so nested time is not counted twice.
+    """
+    __slots__ = ("name", "attrs", "start", "duration_ms", "depth", "parent")
+
+    def __init__(self, name, attrs):
+        self.name = name
+        self.attrs = attrs
+        self.start = 0.0
+        self.duration_ms = 0.0
+        self.depth = 0
+        self.parent = None
+
+    def __enter__(self):
+        stack = _span_stack()
+        self.depth = len(stack)
+        self.parent = stack[-1] if stack else None
+        stack.append(self.name)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration_ms = (time.perf_counter() - self.start) * 1000.0
+        _span_stack().pop()
+        record = {
+            "type": "span",
+            "name": self.name,
+            "ts": time.time(),
+            "duration_ms": round(self.duration_ms, 4),
+            "depth": self.depth,
+            "parent": self.parent,
+            "thread": threading.current_thread().name,
+        }
+        if exc_type is not None:
+            record["error"] = exc_type.__name__
+        if self.attrs:
+            record["attrs"] = self.attrs
+        _run_records().append(record)
+        observe(self.name, self.duration_ms)
+        return False
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram with running count, sum, min and max.
+    """
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        if value < self.min: self.min = value
+        if value > self.max: self.max = value
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "min": self.min if self.count else 0.0,
+            "max": self.max if self.count else 0.0,
+            "buckets": dict(zip([*map(str, self.buckets), "+inf"], self.counts)),
+        }
+
+
+class CallbackTimer:
+    """
+    Audio-callback duration recorder.
+    Durations land in a preallocated ring so the callback never allocates a container;
+    summaries are computed from the main thread.
+    """
+    def __init__(self, capacity=4096):
+        self.durations = np.zeros(capacity, dtype=np.float64)
+        self.capacity = capacity
+        self.written = 0
+        self.read = 0
+
+    def record(self, start):
+        self.durations[self.written % self.capacity] = time.perf_counter() - start
+        self.written += 1
+
+    def drain_ms(self):
+        """
+        Returns durations (ms) recorded since the last drain; oldest first.
+        Entries overwritten before a drain are skipped.
+        """
+        written = self.written
+        first = max(self.read, written - self.capacity)
+        self.read = written
+        if written == first:
+            return np.zeros(0)
+        idx = np.arange(first, written) % self.capacity
+        return self.durations[idx] * 1000.0
+
+    def summary(self, budget_s=None):
+        filled = min(self.written, self.capacity)
+        window = self.durations[:filled] * 1000.0
+        if not filled:
+            return {"calls": 0}
+        result = {
+            "calls": self.written,
+            "mean_ms": float(window.mean()),
+            "p50_ms": float(np.percentile(window, 50)),
+            "p99_ms": float(np.percentile(window, 99)),
+            "max_ms": float(window.max()),
+        }
+        if budget_s:
+            result["over_budget"] = int(np.count_nonzero(window > budget_s * 1000.0))
+        return result
+
+
+def _enabled():
+    return ENABLED or getattr(_local, "enabled", False)
+
+
+def _span_stack():
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def _run_counters():
+    counters = getattr(_local, "counters", None)
+    if counters is None:
+        counters = _local.counters = {}
+    return counters
+
+
+def _run_records():
+    records = getattr(_local, "records", None)
+    if records is None:
+        records = _local.records = []
+    return records
+
+
+# --- PUBLIC API ---
+def enable(export_path=None):
+    """
+    Turns instrumentation on for every thread in the process. Finished spans are appended to
+    export_path (JSON lines) on drain. Per-session toggles should use begin_run(enabled=...).
+    """
+    global ENABLED, _export_path
+    ENABLED = True
+    if export_path:
+        _export_path = export_path
+
+
+def disable():
+    global ENABLED
+    ENABLED = False
+
+
+def span(name, **attrs):
+    """
+    Context manager timing a named block:
+
+        with span("nasa.http", url=url):
+            ...
+    """
+    if not _enabled():
+        return _NULL_SPAN
+    return Span(name, attrs)
+
+
+def timed(name):
+    """
+    Decorator form of span().
+    """
+    def decorator(func):
+        def wrapper(*args, **kwargs):
+            if not _enabled():
+                return func(*args, **kwargs)
+            with Span(name, {}):
+                return func(*args, **kwargs)
+        wrapper.__name__ = func.__name__
+        wrapper.__doc__ = func.__doc__
+        return wrapper
+    return decorator
+
+
+def count(name, value=1):
+    if not _enabled():
+        return
+    run_counters = _run_counters()
+    run_counters[name] = run_counters.get(name, 0) + value
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+def observe(name, value, buckets=DEFAULT_BUCKETS):
+    if not _enabled():
+        return
+    with _lock:
+        hist = _histograms.get(name)
+        if hist is None:
+            hist = _histograms[name] = Histogram(buckets)
+        hist.observe(value)
+
+
+def observe_many(name, values, buckets=DEFAULT_BUCKETS):
+    if not _enabled() or len(values) == 0:
+        return
+    with _lock:
+        hist = _histograms.get(name)
+        if hist is None:
+            hist = _histograms[name] = Histogram(buckets)
+        for value in values:
+            hist.observe(float(value))
+
+
+def begin_run(enabled=False):
+    """
+    Starts a run on this thread: clears leftover spans and counters and sets whether this run
+    is instrumented. Call at the top of every Streamlit rerun with the session's debug toggle;
+    other sessions are unaffected. ICME_TRACE_FILE still instruments the whole process.
+    """
+    _local.enabled = enabled
+    _local.counters = {}
+    _local.records = []
+    _local.stack = []
+
+
+def drain():
+    """
+    Returns the spans recorded on this thread since begin_run()/drain() and exports them.
+    """
+    records = _run_records()
+    _local.records = []
+    if records and _export_path:
+        export_jsonl(_export_path, records)
+    return records
+
+
+def run_counters():
+    """
+    Counter increments made on this thread since begin_run(); snapshot() holds the process totals.
+    """
+    return dict(_run_counters())
+
+
+def top_level(records):
+    """
+    Spans that are not nested in another span, so their durations can be summed.
+    """
+    return [r for r in records if r.get("depth", 0) == 0]
+
+
+def snapshot():
+    with _lock:
+        return {
+            "counters": dict(_counters),
+            "histograms": {name: hist.snapshot() for name, hist in _histograms.items()},
+        }
+
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+    _local.counters = {}
+    _local.records = []
+
+
+def export_jsonl(path, records):
+    directory = os.path.dirname(path)
+    if directory: os.makedirs(directory, exist_ok=True)
+    with _lock:
+        with open(path, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, default=str) + "\n")
+
+
+def export_snapshot(path):
+    """
+    Appends the current counters and histograms to a JSON-lines file as one record.
+    """
+    export_jsonl(path, [{"type": "snapshot", "ts": time.time(), **snapshot()}])
+
+
+if os.environ.get(TRACE_FILE_ENV):
+    enable(os.environ[TRACE_FILE_ENV])
@@ -0,0 +1,33 @@
+import pandas as pd
+import streamlit as st
+
+import Instrumentation as inst
+
+
+def render_timing_panel(debug):
+    """
+    Per-rerun timing panel. Always drains this rerun's spans (exporting them when ICME_TRACE_FILE
+    is set); renders them in the sidebar only in debug mode. Call once, at the end of a page.
+    """
+    run_records = inst.drain()
+    if not debug:
+        return
+
+    with st.sidebar.expander("Timing: This Rerun", expanded=True):
+        if run_records:
+            timing_df = pd.DataFrame([
+                {
+                    "Span": "  " * r.get("depth", 0) + r["name"],
+                    "Duration (ms)": r["duration_ms"],
+                    "Attributes": str(r.get("attrs", "")),
+                }
+                # Spans are recorded as they finish; list them in start order so parents precede children
+                for r in sorted(run_records, key=lambda r: r["ts"] - r["duration_ms"] / 1000.0)
+            ])
+            st.dataframe(timing_df, width="stretch", hide_index=True)
+            total_ms = sum(r["duration_ms"] for r in inst.top_level(run_records))
+            st.caption(f"Total instrumented time (top-level spans): {total_ms:.1f} ms")
+        else:
+            st.caption("No spans recorded this rerun.")
+        st.caption("Counters (this rerun):")
+        st.json(inst.run_counters())
@@ -0,0 +1,186 @@
+import numpy as np
+import pandas as pd
+import geopandas as gpd
+import shapely
+
+# --- MAP LAYER CONFIGURATION ---
+EARTH_RADIUS = 6378137.0
+MAX_LATITUDE = 85.05112878          # Web Mercator limit
+TILE_SIZE = 256
+CELL_PX = 48                        # on-screen size of one aggregation cell
+MAX_ZOOM = 20
+METHODS = ("hex", "grid")
+
+
+# Spatial Functions
+## Web Mercator projection (metres) so cells have a constant on-screen size at each zoom
+def to_mercator(lon, lat):
+    lon = np.asarray(lon, dtype=np.float64)
+    lat = np.clip(np.asarray(lat, dtype=np.float64), -MAX_LATITUDE, MAX_LATITUDE)
+    x = EARTH_RADIUS * np.radians(lon)
+    y = EARTH_RADIUS * np.log(np.tan(np.pi / 4 + np.radians(lat) / 2))
+    return x, y
+
+
+def to_lonlat(x, y):
+    lon = np.degrees(np.asarray(x) / EARTH_RADIUS)
+    lat = np.degrees(2 * np.arctan(np.exp(np.asarray(y) / EARTH_RADIUS)) - np.pi / 2)
+    return lon, lat
+
+
+def cell_size(zoom, cell_px=CELL_PX):
+    """
+    Cell size in Mercator metres for a zoom level (hex circumradius or grid edge).
+    """
+    return cell_px * 2 * np.pi * EARTH_RADIUS / (TILE_SIZE * 2.0 ** zoom)
+
+
+def fit_zoom(lon, lat, width_px=800):
+    """
+    Highest zoom at which every point fits in a viewport of width_px.
+    """
+    if len(lon) == 0:
+        return 1
+    x, y = to_mercator(lon, lat)
+    extent = max(np.ptp(x), np.ptp(y), 1.0)
+    zoom = np.log2(width_px * 2 * np.pi * EARTH_RADIUS / (TILE_SIZE * extent))
+    return int(np.clip(np.floor(zoom), 0, MAX_ZOOM))
+
+
+## Bin assignment, vectorized over every point
+def grid_cells(x, y, size):
+    return np.floor(x / size).astype(np.int64), np.floor(y / size).astype(np.int64)
+
+
+def hex_cells(x, y, size):
+    """
+    Axial (q, r) coordinates of pointy-top hexagons with circumradius `size`, via cube rounding.
+    """
+    q = (np.sqrt(3) / 3 * x - y / 3) / size
+    r = (2 / 3 * y) / size
+    s = -q - r
+    rq, rr, rs = np.round(q), np.round(r), np.round(s)
+    dq, dr, ds = np.abs(rq - q), np.abs(rr - r), np.abs(rs - s)
+    fix_q = (dq > dr) & (dq > ds)
+    fix_r = ~fix_q & (dr > ds)
+    rq = np.where(fix_q, -rr - rs, rq)
+    rr = np.where(fix_r, -rq - rs, rr)
+    return rq.astype(np.int64), rr.astype(np.int64)
+
+
+def cell_centers(a, b, size, method):
+    if method == "hex":
+        return size * np.sqrt(3) * (a + b / 2), size * 1.5 * b
+    return (a + 0.5) * size, (b + 0.5) * size
+
+
+def cell_polygons(a, b, size, method):
+    """
+    Cell outlines in EPSG:4326 as a shapely geometry array.
+    """
+    cx, cy = cell_centers(a, b, size, method)
+    if method == "hex":
+        angles = np.radians(30 + 60 * np.arange(7))
+        xs = cx[:, None] + size * np.cos(angles)[None, :]
+        ys = cy[:, None] + size * np.sin(angles)[None, :]
+    else:
+        half = size / 2
+        xs = cx[:, None] + half * np.array([-1, 1, 1, -1, -1])[None, :]
+        ys = cy[:, None] + half * np.array([-1, -1, 1, 1, -1])[None, :]
+    lon, lat = to_lonlat(xs, ys)
+    return shapely.polygons(np.stack([lon, lat], axis=-1))
+
+
+def aggregate(x, y, zoom, method="hex", cell_px=CELL_PX):
+    """
+    Aggregates projected points into cells for one zoom level.
+    Returns (clusters DataFrame, labels) where labels[i] is the cluster row of point i.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown aggregation method: {method}")
+    size = cell_size(zoom, cell_px)
+    a, b = hex_cells(x, y, size) if method == "hex" else grid_cells(x, y, size)
+
+    # Pack both cell coordinates into one int64 key so np.unique runs on a flat array
+    keys = (a << 32) ^ (b & 0xFFFFFFFF)
+    _, first, labels, counts = np.unique(keys, return_index=True, return_inverse=True, return_counts=True)
+    cell_a, cell_b = a[first], b[first]
+
+    mean_x = np.bincount(labels, weights=x) / counts
+    mean_y = np.bincount(labels, weights=y) / counts
+    lon, lat = to_lonlat(mean_x, mean_y)
+    center_lon, center_lat = to_lonlat(*cell_centers(cell_a, cell_b, size, method))
+
+    clusters = pd.DataFrame({
+        "bin_id": [f"{method}:{zoom}:{i}:{j}" for i, j in zip(cell_a, cell_b)],
+        "count": counts,
+        "lon": lon,
+        "lat": lat,
+        "cell_lon": center_lon,
+        "cell_lat": center_lat,
+        "cell_a": cell_a,
+        "cell_b": cell_b,
+    })
+    return clusters, labels
+
+
+class ClusterPyramid:
+    """
+    Per-dataset cache of aggregated layers. Points are projected once; each zoom level is
+    aggregated on first use and kept, along with the point-to-cluster labels for drill-down.
+    """
+    def __init__(self, lon, lat, method="hex", cell_px=CELL_PX):
+        self.lon = np.asarray(lon, dtype=np.float64)
+        self.lat = np.asarray(lat, dtype=np.float64)
+        self.x, self.y = to_mercator(self.lon, self.lat)
+        self.method = method
+        self.cell_px = cell_px
+        self.levels = {}
+        self.exports = {}
+
+    def __len__(self):
+        return self.lon.size
+
+    def level(self, zoom):
+        if zoom not in self.levels:
+            self.levels[zoom] = aggregate(self.x, self.y, zoom, self.method, self.cell_px)
+        return self.levels[zoom][0]
+
+    def members(self, zoom, bin_id):
+        """
+        Indices of the original points inside one cluster.
+        """
+        clusters = self.level(zoom)
+        labels = self.levels[zoom][1]
+        row = np.flatnonzero(clusters["bin_id"].to_numpy() == bin_id)
+        if row.size == 0:
+            return np.zeros(0, dtype=np.int64)
+        return np.flatnonzero(labels == row[0])
+
+    def features(self, zoom):
+        """
+        Aggregated cells as a GeoDataFrame (EPSG:4326) ready for GeoJSON export.
+        """
+        clusters = self.level(zoom)
+        geometry = cell_polygons(clusters["cell_a"].to_numpy(), clusters["cell_b"].to_numpy(),
+                                 cell_size(zoom, self.cell_px), self.method)
+        return gpd.GeoDataFrame(
+            clusters.drop(columns=["cell_a", "cell_b"]), geometry=geometry, crs="EPSG:4326"
+        )
+
+    def geojson(self, zoom):
+        """
+        GeoJSON export of one level, built on first request and kept with the level.
+        """
+        if zoom not in self.exports:
+            self.exports[zoom] = self.features(zoom).to_json()
+        return self.exports[zoom]
+
+
+def point_coordinates(gdf):
+    """
+    Longitude/latitude arrays of a point GeoDataFrame, reprojected to EPSG:4326 if needed.
+    """
+    if gdf.crs is not None and gdf.crs.to_epsg() != 4326:
+        gdf = gdf.to_crs("EPSG:4326")
+    return shapely.get_x(gdf.geometry.values), shapely.get_y(gdf.geometry.values)
@@ -0,0 +1,83 @@
+import numpy as np
+import streamlit as st
+
+import Map_Layers as layers
+
+# Widget option cap for the cluster drill-down; larger lists stall the browser
+MAX_CLUSTER_OPTIONS = 200
+
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def cluster_pyramid(lon, lat, method):
+    # Keyed on the coordinate arrays themselves, so each dataset is aggregated once per server
+    return layers.ClusterPyramid(lon, lat, method=method)
+
+
+@st.fragment
+def cluster_map(points_gdf, key, title="Map", detail_columns=None):
+    """
+    Shared map layer: aggregates points server-side into hex or grid clusters sized for the
+    selected zoom and sends only the clusters to the browser. One cluster can be drilled into.
+    Runs as a fragment, so its controls rerun only the map and not the page that built the points.
+    """
+    st.subheader(title)
+    if points_gdf is None or len(points_gdf) == 0:
+        st.write("No located points to map.")
+        return
+
+    lon, lat = layers.point_coordinates(points_gdf)
+    valid = np.isfinite(lon) & np.isfinite(lat)
+    lon, lat = lon[valid], lat[valid]
+    points_gdf = points_gdf[valid]
+
+    map_col, control_col = st.columns(spec=[3, 1], gap="large")
+    with control_col:
+        method = st.radio("Aggregation:", options=list(layers.METHODS), key=f"{key}_method", horizontal=True)
+        # st.map does not report the viewport back to the server, so the aggregation zoom is its own control
+        zoom = st.slider("Zoom Level:", 0, layers.MAX_ZOOM, layers.fit_zoom(lon, lat), key=f"{key}_zoom")
+
+    pyramid = cluster_pyramid(lon, lat, method)
+    clusters = pyramid.level(zoom).sort_values("count", ascending=False, ignore_index=True)
+
+    # Circle area grows with cluster size; the largest fills its cell
+    size = layers.cell_size(zoom)
+    clusters["radius_m"] = size * np.cos(np.radians(clusters["lat"])) * np.clip(
+        np.sqrt(clusters["count"] / clusters["count"].max()), 0.2, 1.0
+    ) * 0.5
+
+    with map_col:
+        st.map(clusters, latitude="lat", longitude="lon", size="radius_m", zoom=zoom)
+        st.caption(f"{len(pyramid)} points aggregated into {len(clusters)} {method} features at zoom {zoom}.")
+
+    with control_col:
+        # Cell polygons and their GeoJSON are only built when asked for, then kept per zoom level
+        if zoom in pyramid.exports or st.button("Prepare GeoJSON", key=f"{key}_prepare"):
+            st.download_button(
+                label="Aggregated GeoJSON",
+                data=pyramid.geojson(zoom),
+                file_name=f"{key}_{method}_z{zoom}.geojson",
+                mime="application/geo+json",
+                key=f"{key}_download",
+            )
+
+    # Drill-down on demand: only the chosen cluster's rows are sent
+    with st.expander("Inspect Cluster"):
+        # clusters is sorted by count, so the picker offers the largest ones; any other can be entered
+        top = clusters.head(MAX_CLUSTER_OPTIONS)
+        counts = dict(zip(top["bin_id"], top["count"]))
+        bin_id = st.selectbox(
+            "Cluster:", options=list(counts), key=f"{key}_cluster",
+            format_func=lambda b: f"{b} ({counts[b]} points)",
+        )
+        if len(clusters) > MAX_CLUSTER_OPTIONS:
+            st.caption(f"Showing the {MAX_CLUSTER_OPTIONS} largest of {len(clusters)} clusters.")
+            entered = st.text_input("Or enter a cluster ID:", key=f"{key}_cluster_id").strip()
+            if entered:
+                bin_id = entered
+        member_rows = pyramid.members(zoom, bin_id) if bin_id else []
+        if bin_id and len(member_rows) == 0:
+            st.warning(f"No cluster {bin_id} at zoom {zoom} ({method}).")
+        elif bin_id:
+            members = points_gdf.iloc[member_rows]
+            columns = [c for c in (detail_columns or members.columns) if c != members.geometry.name]
+            st.dataframe(members[columns], width="stretch", hide_index=True)
@@ -1,12 +1,27 @@
+import os
+
+import geopandas as gpd
+import pandas as pd
 import requests
+from shapely.geometry import Point
+
+import Instrumentation as inst
+
+# --- API CONFIGURATION ---
+# Point NASA_POWER_BASE_URL at Research/NASA_Power_Stub.py (e.g. http://127.0.0.1:8765) to work offline
+BASE_URL = os.environ.get("NASA_POWER_BASE_URL", "https://power.larc.nasa.gov")
+
+# Histogram buckets for rows parsed per parameter (day, week, month, quarter, leap year, decade of hours)
+ROW_BUCKETS = (24, 168, 744, 2208, 8784, 87840)
 
 
 # Scientific Functions
 ## Creates NASA Power API URL and retrieves data
-def nasa_power_api(parameters, user_input=False):
+def nasa_power_api(parameters, user_input=False, session=None):
     """
     Environmental Risk Modeling: NASA Power API Ingestion.
     This module anchors public data to specific GPS coordinates to determine open-field conditions.
+    Pass a requests.Session to reuse connections across repeated queries.
     """
     # Allow users to input parameters through terminal
     if user_input:
@@ -43,7 +58,7 @@ def nasa_power_api(parameters, user_input=False):
     url = []
     
     # Load API base URL into empty URL
-    base_url = "https://power.larc.nasa.gov/api/temporal/hourly/point?"
+    base_url = f"{BASE_URL}/api/temporal/hourly/point?"
     url.append(base_url)
     
     # Load parameters into URL after base URL
@@ -54,10 +69,61 @@ def nasa_power_api(parameters, user_input=False):
     url[1] = url[1].replace("&", "") # Adds the first parameter without an & at the start
     url = "".join(url)
     print(url)
-    response = requests.get(url)
-    json_data = response.json()
+    with inst.span("nasa.http", parameters=parameters.get("parameters", "")) as span:
+        response = (session or requests).get(url)
+        span.set(status=response.status_code, bytes=len(response.content))
+    inst.count("nasa.requests")
+    inst.count("nasa.response_bytes", len(response.content))
+    with inst.span("nasa.decode"):
+        json_data = response.json()
     return json_data
 
+## Parses one parameter's hourly values into a DataFrame anchored to the query coordinates
+def parameter_values_frame(data, param, latitude, longitude):
+    """
+    Data Sanitization: converts the NASA Power date-keyed values for one parameter into rows of
+    Date, Value, Units, Latitude, Longitude and Parameter.
+    """
+    nasa_parameter_data = data["properties"]["parameter"]
+    nasa_parameter_info = data["parameters"]
+
+    with inst.span("nasa.parse_rows", parameter=param):
+        parameter_values_list = []
+        for date, value in nasa_parameter_data[param].items():
+            try:
+                parsed_date = pd.to_datetime(date, format="%Y%m%d%H")
+            except ValueError:
+                parsed_date = pd.to_datetime(date, format="%Y%m%d")
+
+            parameter_values_list.append({
+                "Date": parsed_date,
+                "Value": value,
+                "Units": nasa_parameter_info[param]["units"]
+            })
+
+        parameter_values_df = pd.DataFrame(parameter_values_list)
+        parameter_values_df["Date"] = parameter_values_df["Date"].dt.strftime("%Y-%m-%d %H:%M:%S")
+
+        parameter_values_df["Latitude"] = latitude
+        parameter_values_df["Longitude"] = longitude
+        parameter_values_df["Parameter"] = param
+    inst.observe("nasa.rows_per_parameter", len(parameter_values_df), buckets=ROW_BUCKETS)
+    return parameter_values_df
+
+## Anchors a parameter DataFrame to point geometry in the selected CRS
+def parameter_values_geodataframe(parameter_values_df, crs="EPSG:4326"):
+    """
+    GIS Alignment: adds a point geometry per row and returns a GeoDataFrame.
+    The geometry column is also added to the DataFrame passed in.
+    """
+    with inst.span("nasa.geometry", rows=len(parameter_values_df)):
+        parameter_values_df["geometry"] = parameter_values_df.apply(
+            lambda row: Point(row["Longitude"], row["Latitude"]), axis=1
+        )
+
+        gdf = gpd.GeoDataFrame(parameter_values_df, geometry="geometry", crs=crs)
+    return gdf
+
 if __name__ == "__main__":
     start = 20260115
     end = 20260121
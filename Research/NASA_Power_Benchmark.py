@@ -0,0 +1,180 @@
+import argparse
+import contextlib
+import json
+import os
+import statistics
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import geopandas as gpd
+import pandas as pd
+import requests
+
+import Instrumentation as inst
+import NASA_Power_API
+from NASA_Power_API import nasa_power_api, parameter_values_frame, parameter_values_geodataframe
+from NASA_Power_Stub import NASAPowerStub
+
+# --- BENCHMARK DEFAULTS ---
+STAGES = ("nasa.http", "nasa.decode", "nasa.parse_rows", "nasa.geometry", "nasa.to_json", "nasa.to_json_all")
+
+_sessions = threading.local()
+
+
+def site_parameters(index, start, end, parameter_tags):
+    """
+    Query parameters for the index-th synthetic site, spread over a lat/lon grid.
+    """
+    return {
+        "start": start,
+        "end": end,
+        "latitude": round(-60.0 + (index * 7.31) % 120.0, 4),
+        "longitude": round(-180.0 + (index * 13.17) % 360.0, 4),
+        "community": "re",
+        "parameters": ",".join(parameter_tags),
+        "format": "json",
+        "units": "metric",
+        "header": "true",
+        "time-standard": "utc",
+        "site-elevation": "",
+        "wind-elevation": "",
+        "wind-surface": "",
+    }
+
+
+def run_pipeline(parameters, session=None, crs="EPSG:4326"):
+    """
+    One full fetch -> parse -> GeoDataFrame -> export pass, mirroring the NASA Power page.
+    Returns (ok, bytes_exported, rows_parsed).
+    """
+    data = nasa_power_api(parameters=parameters, user_input=False, session=session)
+    if not isinstance(data, dict) or "properties" not in data:
+        return False, 0, 0
+
+    exported = 0
+    rows = 0
+    frames = []
+    for param in data["properties"]["parameter"]:
+        parameter_values_df = parameter_values_frame(data, param, parameters["latitude"], parameters["longitude"])
+        gdf = parameter_values_geodataframe(parameter_values_df, crs=crs)
+        rows += len(gdf)
+        with inst.span("nasa.to_json", parameter=param):
+            exported += len(gdf.to_json())
+        frames.append(gdf)
+
+    if frames:
+        with inst.span("nasa.to_json_all", parameters=len(frames)):
+            exported += len(gpd.GeoDataFrame(pd.concat(frames, ignore_index=True)).to_json())
+    return True, exported, rows
+
+
+def _timed_site(parameters):
+    session = getattr(_sessions, "session", None)
+    if session is None:
+        session = _sessions.session = requests.Session()
+    inst.begin_run()
+    start = time.perf_counter()
+    ok, exported, rows = run_pipeline(parameters, session=session)
+    return ok, exported, rows, time.perf_counter() - start
+
+
+def run_benchmark(sites=20, parameter_count=2, days=7, concurrency=1, base_url=None,
+                  latency=0.0, rate_429=0.0, seed=0):
+    """
+    Runs the pipeline for `sites` sites against a stub (synth mode unless base_url is given).
+    Returns a results dict with throughput, latency percentiles, peak memory and bytes exported.
+    """
+    start_date = datetime(2026, 1, 1)
+    start = start_date.strftime("%Y%m%d")
+    end = (start_date + timedelta(days=days - 1)).strftime("%Y%m%d")
+    parameter_tags = ["T2M", "WD50M", "WS2M", "WS50M", "RH2M", "PRECTOTCORR", "ALLSKY_SFC_SW_DWN"]
+    parameter_tags = (parameter_tags + [f"P{i:03d}" for i in range(parameter_count)])[:parameter_count]
+    queries = [site_parameters(i, start, end, parameter_tags) for i in range(sites)]
+
+    stub = None
+    if base_url is None:
+        stub = NASAPowerStub(mode="synth", port=0, latency=latency, rate_429=rate_429, seed=seed).start()
+        base_url = stub.base_url
+    previous_base_url = NASA_Power_API.BASE_URL
+    NASA_Power_API.BASE_URL = base_url
+
+    was_enabled = inst.ENABLED
+    inst.reset()
+    inst.enable()
+    try:
+        # nasa_power_api prints every URL; keep the benchmark output readable
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            wall_start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                outcomes = list(pool.map(_timed_site, queries))
+            wall = time.perf_counter() - wall_start
+            stage_stats = inst.snapshot()["histograms"]
+
+            # Peak memory is measured on a separate single-site pass so tracing does not skew throughput
+            tracemalloc.start()
+            run_pipeline(queries[0], session=requests.Session())
+            peak_bytes = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    finally:
+        NASA_Power_API.BASE_URL = previous_base_url
+        inst.reset()
+        if not was_enabled: inst.disable()
+        if stub: stub.stop()
+
+    latencies = sorted(o[3] for o in outcomes if o[0])
+    succeeded = len(latencies)
+
+    def percentile(q):
+        if not latencies: return 0.0
+        return latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000.0
+
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "sites": sites,
+        "parameters": parameter_count,
+        "days": days,
+        "rows": sum(o[2] for o in outcomes),
+        "concurrency": concurrency,
+        "latency_s": latency,
+        "rate_429": rate_429,
+        "wall_s": round(wall, 4),
+        "requests_per_s": round(sites / wall, 3) if wall else 0.0,
+        "succeeded": succeeded,
+        "failed": sites - succeeded,
+        "latency_ms": {
+            "mean": round(statistics.fmean(latencies) * 1000.0, 3) if latencies else 0.0,
+            "p50": round(percentile(0.50), 3),
+            "p95": round(percentile(0.95), 3),
+            "max": round(latencies[-1] * 1000.0, 3) if latencies else 0.0,
+        },
+        "stage_mean_ms": {
+            stage: round(stage_stats[stage]["mean"], 3) for stage in STAGES if stage in stage_stats
+        },
+        "peak_pipeline_mb": round(peak_bytes / 1e6, 3),
+        "bytes_exported": sum(o[1] for o in outcomes),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Throughput benchmark for the NASA POWER fetch -> parse -> GeoDataFrame -> export pipeline.")
+    parser.add_argument("--sites", type=int, default=20)
+    parser.add_argument("--parameters", type=int, default=2, help="Parameters per request")
+    parser.add_argument("--days", type=int, default=7, help="Date span per request")
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--base-url", default=None, help="Use an already running stub (e.g. replay mode) instead of an in-process synth stub")
+    parser.add_argument("--latency", type=float, default=0.0, help="Synthetic server latency (seconds)")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Fraction of synthetic 429 responses")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="Append results as a JSON line to this file")
+    args = parser.parse_args()
+
+    results = run_benchmark(sites=args.sites, parameter_count=args.parameters, days=args.days,
+                            concurrency=args.concurrency, base_url=args.base_url,
+                            latency=args.latency, rate_429=args.rate_429, seed=args.seed)
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "a", encoding="utf-8") as f:
+            f.write(json.dumps(results) + "\n")
@@ -0,0 +1,250 @@
+import argparse
+import hashlib
+import json
+import math
+import os
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+
+# --- STUB CONFIGURATION ---
+UPSTREAM_URL = "https://power.larc.nasa.gov"
+CASSETTE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cassettes")
+FILL_VALUE = -999.0
+UPSTREAM_TIMEOUT = 60       # seconds
+
+# Units and names for commonly queried parameters; anything else is synthesized as unitless
+KNOWN_PARAMETERS = {
+    "T2M": ("C", "Temperature at 2 Meters"),
+    "WD50M": ("Degrees", "Wind Direction at 50 Meters"),
+    "WS2M": ("m/s", "Wind Speed at 2 Meters"),
+    "WS50M": ("m/s", "Wind Speed at 50 Meters"),
+    "RH2M": ("%", "Relative Humidity at 2 Meters"),
+    "PRECTOTCORR": ("mm/hour", "Precipitation Corrected"),
+    "ALLSKY_SFC_SW_DWN": ("Wh/m^2", "All Sky Surface Shortwave Downward Irradiance"),
+}
+
+
+def cassette_key(path, query):
+    """
+    Stable cassette name for a request: path plus sorted query, independent of parameter order.
+    """
+    canonical = path + "?" + "&".join(f"{k}={v}" for k, v in sorted(query.items()))
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+def synthesize_response(query):
+    """
+    Builds a NASA POWER hourly point response for any date span and parameter list.
+    Values are deterministic per site and parameter so repeated runs export identical bytes.
+    """
+    start = datetime.strptime(str(query.get("start", "20260101")), "%Y%m%d")
+    end = datetime.strptime(str(query.get("end", query.get("start", "20260101"))), "%Y%m%d")
+    latitude = float(query.get("latitude", 0.0) or 0.0)
+    longitude = float(query.get("longitude", 0.0) or 0.0)
+    elevation = float(query.get("site-elevation", 0.0) or 0.0)
+    parameter_tags = [p for p in str(query.get("parameters", "T2M")).split(",") if p]
+
+    hours = int((end - start).total_seconds() // 3600) + 24
+    timestamps = [(start + timedelta(hours=h)).strftime("%Y%m%d%H") for h in range(hours)]
+
+    parameter_data = {}
+    parameter_info = {}
+    for tag in parameter_tags:
+        units, longname = KNOWN_PARAMETERS.get(tag, ("unitless", f"Synthetic {tag}"))
+        seed = f"{latitude:.4f},{longitude:.4f},{tag}"
+        rng = random.Random(seed)
+        base = rng.uniform(-10.0, 25.0)
+        swing = rng.uniform(2.0, 8.0)
+        values = {}
+        for h, stamp in enumerate(timestamps):
+            if rng.random() < 0.002:
+                values[stamp] = FILL_VALUE
+            else:
+                values[stamp] = round(base + swing * math.sin(2 * math.pi * (h % 24) / 24) + rng.gauss(0, 0.5), 2)
+        parameter_data[tag] = values
+        parameter_info[tag] = {"units": units, "longname": longname}
+
+    return {
+        "type": "Feature",
+        "geometry": {"type": "Point", "coordinates": [longitude, latitude, elevation]},
+        "properties": {"parameter": parameter_data},
+        "header": {
+            "title": "NASA/POWER Source Native Resolution Hourly Data (Synthetic Stub)",
+            "api": {"version": "stub", "name": "POWER Hourly API"},
+            "sources": ["stub"],
+            "fill_value": FILL_VALUE,
+            "time_standard": str(query.get("time-standard", "utc")).upper(),
+            "start": start.strftime("%Y%m%d"),
+            "end": end.strftime("%Y%m%d"),
+        },
+        "messages": [],
+        "parameters": parameter_info,
+        "times": {"data": 0.0, "process": 0.0},
+    }
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """
+    Serves /api/... requests according to the owning server's mode:
+    record (proxy upstream and save), replay (serve saved responses) or synth (generate).
+    """
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        stub = self.server.stub
+        split = urlsplit(self.path)
+        query = dict(parse_qsl(split.query, keep_blank_values=True))
+
+        if stub.latency or stub.jitter:
+            time.sleep(stub.latency + stub.rng_uniform(0.0, stub.jitter))
+
+        if stub.should_rate_limit():
+            self._send_json(429, {"header": {"title": "Too Many Requests"}, "messages": ["Rate limit exceeded (stub)."]},
+                            extra_headers={"Retry-After": "1"})
+            return
+
+        if stub.mode == "synth":
+            self._send_json(200, synthesize_response(query))
+        elif stub.mode == "record":
+            # Record once: an existing cassette is served without contacting NASA again
+            cassette = stub.load(split.path, query)
+            if cassette is None:
+                status, body = stub.record(split.path, query, split.query)
+            else:
+                status, body = cassette["status"], cassette["body"].encode("utf-8")
+            self._send_raw(status, body)
+        else:
+            cassette = stub.load(split.path, query)
+            if cassette is None:
+                self._send_json(404, {"messages": [f"No recorded response for {self.path} (stub replay)."]})
+            else:
+                self._send_raw(cassette["status"], cassette["body"].encode("utf-8"))
+
+    def _send_json(self, status, payload, extra_headers=None):
+        self._send_raw(status, json.dumps(payload).encode("utf-8"), extra_headers)
+
+    def _send_raw(self, status, body, extra_headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (extra_headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.stub.verbose:
+            super().log_message(format, *args)
+
+
+class NASAPowerStub:
+    """
+    Local stand-in for the NASA POWER API.
+    """
+    def __init__(self, mode="synth", host="127.0.0.1", port=8765, cassette_dir=CASSETTE_DIR,
+                 latency=0.0, jitter=0.0, rate_429=0.0, seed=0, upstream=UPSTREAM_URL, verbose=False):
+        if mode not in ("record", "replay", "synth"):
+            raise ValueError(f"Unknown stub mode: {mode}")
+        self.mode = mode
+        self.cassette_dir = cassette_dir
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_429 = rate_429
+        self.upstream = upstream
+        self.verbose = verbose
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), StubHandler)
+        self.server.daemon_threads = True
+        self.server.stub = self
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def rng_uniform(self, low, high):
+        with self._rng_lock:
+            return self._rng.uniform(low, high)
+
+    def should_rate_limit(self):
+        if not self.rate_429:
+            return False
+        with self._rng_lock:
+            return self._rng.random() < self.rate_429
+
+    def cassette_path(self, path, query):
+        return os.path.join(self.cassette_dir, cassette_key(path, query) + ".json")
+
+    def load(self, path, query):
+        cassette_path = self.cassette_path(path, query)
+        if not os.path.exists(cassette_path):
+            return None
+        with open(cassette_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def record(self, path, query, raw_query):
+        """
+        Fetches from NASA and saves the response. Only 200 responses are saved, so rate limits
+        and server errors are passed through once instead of being replayed forever.
+        """
+        try:
+            response = requests.get(f"{self.upstream}{path}?{raw_query}", timeout=UPSTREAM_TIMEOUT)
+        except requests.RequestException as e:
+            return 502, json.dumps({"messages": [f"Upstream request failed (stub record): {e}"]}).encode("utf-8")
+        if response.status_code == 200:
+            os.makedirs(self.cassette_dir, exist_ok=True)
+            cassette = {"path": path, "query": query, "status": response.status_code, "body": response.text}
+            cassette_path = self.cassette_path(path, query)
+            with open(cassette_path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(cassette, f)
+            os.replace(cassette_path + ".tmp", cassette_path)
+        return response.status_code, response.content
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, name="nasa-power-stub", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record/replay/synthesize stub for the NASA POWER hourly point API.")
+    parser.add_argument("--mode", choices=["record", "replay", "synth"], default="replay")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--cassettes", default=CASSETTE_DIR, help="Directory of recorded responses")
+    parser.add_argument("--latency", type=float, default=0.0, help="Fixed delay per request (seconds)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra uniform random delay (seconds)")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    stub = NASAPowerStub(mode=args.mode, host=args.host, port=args.port, cassette_dir=args.cassettes,
+                         latency=args.latency, jitter=args.jitter, rate_429=args.rate_429,
+                         seed=args.seed, verbose=args.verbose)
+    print(f"NASA POWER stub ({args.mode}) listening on {stub.base_url}")
+    print(f"Use: NASA_POWER_BASE_URL={stub.base_url}")
+    try:
+        stub.server.serve_forever()
+    except KeyboardInterrupt:
+        stub.server.server_close()
+        print("\nNASA POWER stub offline.")
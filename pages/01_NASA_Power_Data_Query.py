@@ -4,7 +4,6 @@ import os
 import sys
 import time
 import geopandas as gpd
-from shapely.geometry import Point
 
 st.warning("This tool is a GIS-formatting utility for the [NASA POWER API](https://power.larc.nasa.gov/docs/tutorials/). Please read through the specifics as this page uses pre-configured formats (UTC, re) that can be individualized in a script. For real-time critical safety decisions, always cross-reference with NASA POWER Official.")
 st.warning("There may be extra values in the downloaded data compared to what is show in the tables here. This is because this app removes all '-999' values from the display tables, but the downloads contain the full dataset including these null/missing value indicators.")
@@ -19,9 +18,14 @@ else:
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 RESEARCH_DIR = os.path.join(BASE_DIR, "Research")
 sys.path.append(RESEARCH_DIR)
-from NASA_Power_API import nasa_power_api
+from NASA_Power_API import nasa_power_api, parameter_values_frame, parameter_values_geodataframe
+import Instrumentation as inst
+from Instrumentation_View import render_timing_panel
+from Map_View import cluster_map
 print(BASE_DIR)
 
+inst.begin_run(enabled=debug)
+
 ## NASA Power API Parameters
 
 #### Row 1
@@ -118,7 +122,8 @@ class NASAPowerData:
         self.data = st.session_state.api_data 
 
     def fetch_data(self):
-        fetched = nasa_power_api(parameters=self.parameters, user_input=False)
+        with inst.span("nasa.fetch"):
+            fetched = nasa_power_api(parameters=self.parameters, user_input=False)
         if fetched and isinstance(fetched, dict):
             st.session_state.api_data = fetched
             self.data = fetched
@@ -162,7 +167,6 @@ class NASAPowerData:
             return
 
         nasa_parameter_data = self.data["properties"]["parameter"]
-        nasa_parameter_info = self.data["parameters"]
 
         combined_geojson_data = []
         crs_options = {
@@ -172,56 +176,48 @@ class NASAPowerData:
         selected_crs_code = crs_options[selected_crs]
 
         for param in nasa_parameter_data:
-            parameter_values_list = []
-            for date, value in nasa_parameter_data[param].items():
-                try:
-                    parsed_date = pd.to_datetime(date, format="%Y%m%d%H")
-                except ValueError:
-                    parsed_date = pd.to_datetime(date, format="%Y%m%d")
-
-                parameter_values_list.append({
-                    "Date": parsed_date,
-                    "Value": value,
-                    "Units": nasa_parameter_info[param]["units"]
-                })
-
-            parameter_values_df = pd.DataFrame(parameter_values_list)
-            parameter_values_df["Date"] = parameter_values_df["Date"].dt.strftime("%Y-%m-%d %H:%M:%S")
-
-            parameter_values_df["Latitude"] = self.parameters["latitude"]
-            parameter_values_df["Longitude"] = self.parameters["longitude"]
-            parameter_values_df["Parameter"] = param
-
-            parameter_values_df["geometry"] = parameter_values_df.apply(
-                lambda row: Point(row["Longitude"], row["Latitude"]), axis=1
+            parameter_values_df = parameter_values_frame(
+                self.data, param, self.parameters["latitude"], self.parameters["longitude"]
             )
+            gdf = parameter_values_geodataframe(parameter_values_df, crs=selected_crs_code)
 
-            gdf = gpd.GeoDataFrame(parameter_values_df, geometry="geometry", crs=selected_crs_code)
+            with inst.span("nasa.to_json", parameter=param):
+                gdf_json = gdf.to_json()
+            inst.count("nasa.exported_bytes", len(gdf_json))
 
             st.sidebar.download_button(
                 label=f"{param} GeoJSON",
-                data=gdf.to_json(),
+                data=gdf_json,
                 file_name=f"{param}_data.geojson",
                 mime="application/geo+json"
             )
 
             combined_geojson_data.append(gdf)
 
-            parameter_values_df["geometry_wkt"] = parameter_values_df["geometry"].apply(lambda geom: geom.wkt if geom else None)
+            with inst.span("nasa.render_table", parameter=param):
+                parameter_values_df["geometry_wkt"] = parameter_values_df["geometry"].apply(lambda geom: geom.wkt if geom else None)
 
-            display_df = parameter_values_df.drop(columns=["geometry"])
+                display_df = parameter_values_df.drop(columns=["geometry"])
 
-            st.dataframe(display_df, width="stretch")
+                st.dataframe(display_df, width="stretch")
 
         if combined_geojson_data:
-            combined_gdf = gpd.GeoDataFrame(pd.concat(combined_geojson_data, ignore_index=True))
+            with inst.span("nasa.to_json_all", parameters=len(combined_geojson_data)):
+                combined_gdf = gpd.GeoDataFrame(pd.concat(combined_geojson_data, ignore_index=True))
+                combined_json = combined_gdf.to_json()
+            inst.count("nasa.exported_bytes", len(combined_json))
             st.sidebar.download_button(
                 label="All Data as GeoJSON",
-                data=combined_gdf.to_json(),
+                data=combined_json,
                 file_name="all_parameters_data.geojson",
                 mime="application/geo+json"
             )
 
+            # Every hourly row shares the query point; the map layer collapses them into one feature
+            with inst.span("nasa.map"):
+                cluster_map(combined_gdf, key="nasa", title="Site Map",
+                            detail_columns=["Date", "Value", "Units", "Parameter"])
+
 parameters = {
     "start": start,
     "end": end,
@@ -245,8 +241,13 @@ if st.button("Get NASA Power Data"):
 
 if st.session_state.api_data is not None:
     nasa_power_api_instance.data = st.session_state.api_data
-    nasa_power_api_instance.process_data()
-    nasa_power_api_instance.process_parameter_values()
+    with inst.span("nasa.process_data"):
+        nasa_power_api_instance.process_data()
+    with inst.span("nasa.process_parameter_values"):
+        nasa_power_api_instance.process_parameter_values()
+
+# Per-rerun Timing Panel
+render_timing_panel(debug)
 
 # Footer Navigation
 st.divider()
@@ -2,16 +2,23 @@ import streamlit as st
 import os
 import sys
 import pandas as pd
+import geopandas as gpd
 
 # --- PATH CONFIGURATION ---
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 RESEARCH_DIR = os.path.join(BASE_DIR, "Research")
 sys.path.append(RESEARCH_DIR)
 from IMG_Processing import image_location
+import Instrumentation as inst
+from Instrumentation_View import render_timing_panel
+from Map_View import cluster_map
 
 # --- PAGE SETUP ---
 st.set_page_config(page_title="Image Metadata Ingestion | IC.ME", layout="wide")
 
+debug = st.sidebar.toggle("Debug Mode:")
+inst.begin_run(enabled=debug)
+
 # --- HEADER BLOCKS (NASA Power Style) ---
 st.warning("This tool is a Metadata Extraction utility. It anchors site documentation to geospatial coordinates. For real-time critical safety decisions, ensure that the source hardware (mobile/camera) has been calibrated for GPS accuracy.")
 st.info("Validation through Data Ingestion: This module extracts raw spatial information to visualize site conditions with precision.")
@@ -36,8 +43,9 @@ with row1_col1:
         TEMP_DIR = "temp_uploads"
         if not os.path.exists(TEMP_DIR): os.makedirs(TEMP_DIR)
         temp_file_path = os.path.join(TEMP_DIR, uploaded_image.name)
-        with open(temp_file_path, "wb") as f:
-            f.write(uploaded_image.getbuffer())
+        with inst.span("img.write_temp", bytes=uploaded_image.size):
+            with open(temp_file_path, "wb") as f:
+                f.write(uploaded_image.getbuffer())
 
 with row1_col2:
     st.subheader("Source Visualization")
@@ -100,6 +108,53 @@ if uploaded_image:
 else:
     st.info("Ingest an image to determine the compliance path.")
 
+@st.cache_data(show_spinner=False, max_entries=8)
+def survey_locations(file_keys, _survey_images):
+    # Keyed on (file_id, name, size) so map reruns do not re-read EXIF from every upload
+    survey_rows, unlocated = [], 0
+    with inst.span("img.survey_extract", files=len(_survey_images)):
+        for survey_image in _survey_images:
+            try:
+                survey_gps = image_location(survey_image)
+            except Exception:
+                unlocated += 1
+                continue
+            survey_rows.append({
+                "File": survey_image.name,
+                "Latitude": survey_gps["Latitude"]["Decimal"],
+                "Longitude": survey_gps["Longitude"]["Decimal"]
+            })
+    return survey_rows, unlocated
+
+# Establish Row 3: Survey Map
+st.divider()
+st.subheader("Survey Map")
+survey_images = st.file_uploader(
+    "Upload survey photos to map their locations",
+    type=["png", "jpg", "jpeg"],
+    accept_multiple_files=True,
+    key="survey_images"
+)
+
+if survey_images:
+    survey_keys = tuple((f.file_id, f.name, f.size) for f in survey_images)
+    survey_rows, unlocated = survey_locations(survey_keys, survey_images)
+    if unlocated:
+        st.warning(f"{unlocated} image(s) had no usable GPS metadata and were skipped.")
+    if survey_rows:
+        survey_df = pd.DataFrame(survey_rows)
+        survey_gdf = gpd.GeoDataFrame(
+            survey_df, geometry=gpd.points_from_xy(survey_df["Longitude"], survey_df["Latitude"]), crs="EPSG:4326"
+        )
+        with inst.span("img.map"):
+            cluster_map(survey_gdf, key="survey", title="Photo Locations",
+                        detail_columns=["File", "Latitude", "Longitude"])
+else:
+    st.info("Ingest survey photos to aggregate their locations on the map.")
+
+# Per-rerun Timing Panel
+render_timing_panel(debug)
+
 # Footer Navigation
 st.divider()
 nav_col1, nav_col2, nav_col3 = st.columns(3)
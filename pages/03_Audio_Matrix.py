@@ -1,5 +1,15 @@
 import streamlit as st
 import numpy as np
+import pandas as pd
+import os
+import sys
+
+# --- PATH CONFIGURATION ---
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESEARCH_DIR = os.path.join(BASE_DIR, "Research")
+sys.path.append(RESEARCH_DIR)
+import Audio_Matrix_Simulator as sim
+from Audio_Matrix_Stream import MeterSubscriber, MONITOR_PORT
 
 st.set_page_config(page_title="Audio Matrix | IC.ME", layout="wide")
 
@@ -35,6 +45,191 @@ with col3:
 
 st.divider()
 
+# Parameter Sweep Simulation
+st.header("Parameter Sweep Simulation")
+st.markdown("""
+Runs the engine's actual fader recursion (threshold gate, attack/release smoothing per block and the
+`(1 - fader)²` wire curve) over a level trace for every threshold/attack/release combination at once.
+Use it to tune a site before any live trial runs.
+""")
+
+
+# Charting more configurations than this is unreadable; the full grid stays in the statistics table
+MAX_CHART_OPTIONS = 200
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def run_sweep(levels_db, thresholds, attacks, releases, sample_rate, block_size):
+    # Statistics only: trajectories for the whole grid would be n_configs x n_blocks floats
+    return sim.simulate_grid(levels_db, thresholds, attacks, releases,
+                             sample_rate=sample_rate, block_size=block_size, keep_trajectories=False)
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def run_trajectories(levels_db, thresholds, attacks, releases, sample_rate, block_size):
+    return sim.simulate_configs(levels_db, thresholds, attacks, releases,
+                                sample_rate=sample_rate, block_size=block_size)["fader"]
+
+
+sweep_col1, sweep_col2 = st.columns(spec=[1, 2], border=True, gap="large")
+
+with sweep_col1:
+    st.subheader("Level Trace")
+    trace_source = st.radio("Source:", options=["Synthetic", "Upload CSV (dBFS per block)", "Upload WAV"])
+    sample_rate = sim.SAMPLE_RATE
+    block_size = st.select_slider("Block Size:", options=[256, 512, 1024, 2048, 4096], value=sim.BLOCK_SIZE)
+    levels_db = None
+
+    if trace_source == "Synthetic":
+        duration_s = st.slider("Duration (s)", 10, 600, 60)
+        talk_fraction = st.slider("Desk Talk Fraction", 0.05, 0.95, 0.3)
+        speech_db = st.slider("Desk Speech Level (dBFS)", -60, 0, -28)
+        noise_db = st.slider("Room Noise Floor (dBFS)", -80, -20, -55)
+        seed = st.number_input("Seed", value=0, step=1)
+        levels_db = sim.synthetic_levels(duration_s, talk_fraction=talk_fraction, speech_db=speech_db,
+                                         noise_db=noise_db, block_size=block_size, seed=int(seed))
+    elif trace_source.startswith("Upload CSV"):
+        uploaded_trace = st.file_uploader("Level trace", type=["csv", "txt"])
+        if uploaded_trace:
+            try:
+                trace_columns = sim.csv_columns(uploaded_trace)
+                level_name = None
+                if len(trace_columns) > 1:
+                    # Never guess between e.g. time and level columns; preselect only an unambiguous level name
+                    column_names = list(trace_columns)
+                    guess = sim.level_column(column_names)
+                    level_name = st.selectbox("Level Column (dBFS):", column_names,
+                                              index=column_names.index(guess) if guess else None)
+                if len(trace_columns) <= 1 or level_name:
+                    levels_db = sim.levels_from_columns(trace_columns, column=level_name)
+            except ValueError as e:
+                st.error(f"Could not read level trace: {e}")
+    else:
+        uploaded_wav = st.file_uploader("Desk mic recording", type=["wav"])
+        wav_channel = st.number_input("Channel", value=0, min_value=0, step=1)
+        wav_gain = st.number_input("Mic Gain (engine default for Main Station: 6.0)", value=6.0)
+        if uploaded_wav:
+            try:
+                levels_db, sample_rate = sim.levels_from_wav(uploaded_wav, channel=int(wav_channel),
+                                                             gain=wav_gain, block_size=block_size)
+            except (ValueError, EOFError) as e:
+                st.error(f"Could not decode WAV file: {e}")
+
+    st.subheader("Sweep Grid")
+    threshold_range = st.slider("Threshold Range (dB)", -70.0, 0.0, (-50.0, -20.0))
+    threshold_steps = st.slider("Threshold Steps", 1, 64, 16)
+    attack_range = st.slider("Attack Range (s)", 0.001, 1.0, (0.005, 0.5))
+    attack_steps = st.slider("Attack Steps", 1, 64, 12)
+    release_range = st.slider("Release Range (s)", 0.01, 5.0, (0.05, 3.0))
+    release_steps = st.slider("Release Steps", 1, 64, 12)
+
+with sweep_col2:
+    if levels_db is None or len(levels_db) == 0:
+        st.write("Awaiting level trace...")
+    else:
+        thresholds = np.linspace(*threshold_range, threshold_steps)
+        attacks = np.geomspace(*attack_range, attack_steps)
+        releases = np.geomspace(*release_range, release_steps)
+        with st.spinner("Sweeping configurations..."):
+            result = run_sweep(levels_db, thresholds, attacks, releases, sample_rate, block_size)
+
+        stats_df = pd.DataFrame({
+            "Threshold (dB)": result["threshold_db"],
+            "Attack (s)": result["attack_s"],
+            "Release (s)": result["release_s"],
+            **{name.replace("_", " ").title(): values for name, values in result["stats"].items()},
+        })
+        n_configs = len(stats_df)
+        st.caption(f"{n_configs} configurations × {len(levels_db)} blocks ({len(levels_db) * result['block_s']:.1f} s of audio)")
+
+        st.subheader("Ducking Statistics")
+        st.dataframe(stats_df, width="stretch", hide_index=True)
+
+        st.subheader("Fader Trajectories")
+        nearest_engine = int(np.argmin(
+            np.abs(result["threshold_db"] - sim.THRESHOLD_DB)
+            + np.abs(np.log(result["attack_s"] / sim.ATTACK_TIME))
+            + np.abs(np.log(result["release_s"] / sim.RELEASE_TIME))
+        ))
+        stat_columns = [name.replace("_", " ").title() for name in result["stats"]]
+        rank_col1, rank_col2 = st.columns(2)
+        rank_by = rank_col1.selectbox("Rank Configurations By:", options=stat_columns,
+                                      index=stat_columns.index("Mean Wire Gain"))
+        ascending = rank_col2.radio("Order:", options=["Highest", "Lowest"], horizontal=True) == "Lowest"
+        ranked = stats_df[rank_by].sort_values(ascending=ascending, kind="stable").index[:MAX_CHART_OPTIONS]
+        chart_options = [nearest_engine] + [int(i) for i in ranked if i != nearest_engine]
+        selected = st.multiselect(
+            f"Configurations (engine default plus top {MAX_CHART_OPTIONS} by {rank_by})",
+            options=chart_options, default=[nearest_engine],
+            format_func=lambda i: f"#{i}: {result['threshold_db'][i]:.1f} dB / {result['attack_s'][i]:.3f} s / {result['release_s'][i]:.2f} s",
+        )
+        if selected:
+            # Only the charted configurations are re-simulated with trajectories kept
+            faders = run_trajectories(levels_db, result["threshold_db"][selected], result["attack_s"][selected],
+                                      result["release_s"][selected], sample_rate, block_size)
+            # Decimate long traces so the chart stays responsive
+            step = max(1, len(levels_db) // 2000)
+            time_s = np.arange(0, len(levels_db), step) * result["block_s"]
+            trajectory_df = pd.DataFrame(
+                {f"#{i}": faders[k, ::step] for k, i in enumerate(selected)}, index=pd.Index(time_s, name="Time (s)")
+            )
+            st.line_chart(trajectory_df, y_label="Fader")
+            st.line_chart(pd.DataFrame({"Desk Level (dBFS)": levels_db[::step]}, index=trajectory_df.index))
+
+st.divider()
+
+# Live Room Monitor
+st.header("Live Room Monitor")
+st.markdown("""
+Each running `Research/Audio_Matrix_Engine.py` publishes meter and fader snapshots over UDP
+(`MONITOR_HOST`/`MONITOR_PORT` in `Research/Audio_Matrix_Stream.py`). This view refreshes on its own without
+rerunning the page; the engine's audio callback never waits on it.
+""")
+
+
+@st.cache_resource
+def meter_subscriber():
+    # One socket per server process on the configured port, shared by every browser session
+    subscriber = MeterSubscriber(address=("0.0.0.0", MONITOR_PORT))
+    subscriber.start()
+    return subscriber
+
+
+def level_fraction(level, floor_db=-60.0):
+    level_db = 20.0 * np.log10(max(level, 1e-6))
+    return float(np.clip((level_db - floor_db) / -floor_db, 0.0, 1.0)), level_db
+
+
+@st.fragment(run_every=1.0)
+def live_monitor(subscriber):
+    rooms = subscriber.latest()
+    if not rooms:
+        st.write(f"Awaiting engine snapshots on UDP port {subscriber.sock.getsockname()[1]}...")
+        return
+
+    room_cols = st.columns(min(len(rooms), 3), border=True)
+    for i, (room, snap) in enumerate(rooms.items()):
+        with room_cols[i % len(room_cols)]:
+            st.subheader(room)
+            if snap["stale"]:
+                st.warning(f"No update for {snap['age_s']:.1f} s: engine offline or unreachable.")
+            color = "red" if snap["mode"] == "STATIONARY PRIORITY" else "blue"
+            st.markdown(f"**Current Path:** :{color}[{snap['mode']}]")
+            st.progress(float(snap["fader"]), text=f"Matrix Fader: {snap['fader']:.2f}")
+            for channel in snap["channels"]:
+                fraction, level_db = level_fraction(channel["peak"])
+                st.progress(fraction, text=f"{channel['name']} ({channel['location']}): {level_db:.1f} dBFS peak")
+            st.caption(f"Clipped samples: {snap['clipped_samples']} | Xrun blocks: {snap['xrun_blocks']} | Age: {snap['age_s']:.1f} s")
+
+
+if st.toggle("Enable Live Monitor"):
+    try:
+        live_monitor(meter_subscriber())
+    except OSError as e:
+        st.error(f"Could not listen on UDP port {MONITOR_PORT}: {e}")
+
+st.divider()
+
 st.markdown("""
 ### Local Implementation
 The live audio engine requires direct hardware access. To implement this on-site with your wireless headsets 